@@ -0,0 +1,169 @@
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+
+HOURS_PER_WEEK = 7 * 24
+
+ALERT_COLUMNS = ['Timestamp', 'Station_ID', 'Passengers', 'Expected', 'Z_Score', 'Type']
+
+def hour_of_week(timestamp):
+    """
+    Get the hour-of-week slot (0 = Monday 00:00) for a timestamp
+    """
+    return timestamp.weekday() * 24 + timestamp.hour
+
+class StationAnomalyDetector:
+    """
+    Online detector for abnormal surges and drops in station ridership.
+
+    Keeps running statistics for every (station, hour-of-week) slot in
+    fixed-size arrays, so each new count is an O(1) update and memory
+    grows linearly with the number of stations.
+    """
+
+    def __init__(self, station_ids, alpha=0.2, z_threshold=5.0, min_observations=6,
+                 overdispersion=0.1, prior_weight=4.0, min_std=5.0, max_alerts=1000,
+                 max_lateness=pd.Timedelta(hours=6)):
+        self.station_index = {station_id: i for i, station_id in enumerate(station_ids)}
+        self.station_ids = np.asarray(station_ids)
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_observations = min_observations
+        self.overdispersion = overdispersion
+        self.prior_weight = prior_weight
+        self.min_std = min_std
+        self.max_lateness = max_lateness
+
+        shape = (len(self.station_ids), HOURS_PER_WEEK)
+
+        # Welford running mean and sum of squared deviations per slot
+        self.count = np.zeros(shape, dtype=np.int32)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+        # Seasonal baseline that tracks recent weeks more closely
+        self.ewma = np.zeros(shape)
+
+        # Latest timestamp processed for each station, so only new rows are
+        # fed and a station reporting late for an hour is still scored
+        self.last_seen = np.full(len(self.station_ids), np.datetime64('NaT'), dtype='datetime64[ns]')
+        self.alerts = deque(maxlen=max_alerts)
+        self._lock = threading.Lock()
+
+    def update(self, station_id, timestamp, passengers):
+        """
+        Add one station count and return an alert dict if it is anomalous
+        """
+        alerts = self.update_batch(timestamp, [station_id], [passengers])
+        return alerts[0] if alerts else None
+
+    def update_batch(self, timestamp, station_ids, passengers):
+        """
+        Add counts for several stations at one timestamp and return alerts.
+        Each station may appear at most once per batch.
+        """
+        rows = np.array([self.station_index[station_id] for station_id in station_ids], dtype=np.intp)
+        x = np.asarray(passengers, dtype=float)
+        slot = hour_of_week(timestamp)
+
+        n = self.count[rows, slot]
+        mean = self.mean[rows, slot]
+        m2 = self.m2[rows, slot]
+        baseline = self.ewma[rows, slot]
+
+        # A handful of weekly samples gives a noisy variance, so shrink it
+        # towards an overdispersed Poisson variance (mu + (k * mu)^2)
+        sample_var = m2 / np.maximum(n - 1, 1)
+        prior_var = baseline + (self.overdispersion * baseline) ** 2
+        dof = np.maximum(n - 1, 0)
+        var = (dof * sample_var + self.prior_weight * prior_var) / (dof + self.prior_weight)
+        std = np.maximum(np.sqrt(var), self.min_std)
+
+        # Score against the existing baseline before folding the new count in
+        z = (x - baseline) / std
+        flagged = (n >= self.min_observations) & (np.abs(z) >= self.z_threshold)
+
+        # Cap flagged counts at the threshold so a surge or drop can't drag
+        # the baseline and spread with it; a lasting shift is still absorbed
+        # over the following weeks
+        limit = self.z_threshold * std
+        x_update = np.where(flagged, np.clip(x, baseline - limit, baseline + limit), x)
+
+        # Welford update
+        n_new = n + 1
+        delta = x_update - mean
+        mean_new = mean + delta / n_new
+        self.count[rows, slot] = n_new
+        self.mean[rows, slot] = mean_new
+        self.m2[rows, slot] = m2 + delta * (x_update - mean_new)
+
+        # EWMA update, seeded with the first observation
+        self.ewma[rows, slot] = np.where(n == 0, x_update, baseline + self.alpha * (x_update - baseline))
+
+        alerts = []
+        for i in np.flatnonzero(flagged):
+            alerts.append({
+                'Timestamp': timestamp,
+                'Station_ID': self.station_ids[rows[i]].item(),
+                'Passengers': int(x[i]),
+                'Expected': round(float(baseline[i])),
+                'Z_Score': round(float(z[i]), 2),
+                'Type': 'Surge' if z[i] > 0 else 'Drop'
+            })
+        return alerts
+
+    @property
+    def last_timestamp(self):
+        """
+        Latest timestamp processed for any station, or None before the first row
+        """
+        if np.isnat(self.last_seen).all():
+            return None
+        return pd.Timestamp(np.nanmax(self.last_seen))
+
+    def resume_from(self):
+        """
+        Earliest timestamp the next batch of the feed needs to include, or None
+        to read the whole feed. Rows that arrive more than `max_lateness` after
+        the latest processed hour are not seen again.
+        """
+        last_timestamp = self.last_timestamp
+        return None if last_timestamp is None else last_timestamp - self.max_lateness
+
+    def process(self, hourly_data):
+        """
+        Feed the rows of an hourly feed that are newer than the last timestamp
+        processed for their station and return the new alerts.
+        Rows for stations the detector doesn't know are ignored, as are rows at
+        or before a station's last processed timestamp, so re-sending an
+        overlapping window is safe but a station's counts must arrive in order.
+        """
+        with self._lock:
+            hourly_data = hourly_data[hourly_data['Station_ID'].isin(self.station_index)]
+            rows = hourly_data['Station_ID'].map(self.station_index).to_numpy(dtype=np.intp)
+            timestamps = hourly_data['Timestamp'].to_numpy(dtype='datetime64[ns]')
+            seen = self.last_seen[rows]
+            hourly_data = hourly_data[np.isnat(seen) | (timestamps > seen)]
+
+            alerts = []
+            for timestamp, group in hourly_data.sort_values('Timestamp').groupby('Timestamp', sort=False):
+                alerts.extend(self.update_batch(timestamp, group['Station_ID'], group['Passengers']))
+                self.last_seen[group['Station_ID'].map(self.station_index).to_numpy(dtype=np.intp)] = timestamp.to_datetime64()
+
+            self.alerts.extend(alerts)
+            return alerts
+
+    def recent_alerts(self):
+        """
+        Get the most recent alerts as a dataframe
+        """
+        with self._lock:
+            return pd.DataFrame(list(self.alerts), columns=ALERT_COLUMNS)
+
+def detect_anomalies(hourly_data, station_ids, **kwargs):
+    """
+    Replay hourly station counts through a new detector and return the alerts
+    """
+    detector = StationAnomalyDetector(station_ids, **kwargs)
+    return pd.DataFrame(detector.process(hourly_data), columns=ALERT_COLUMNS)
@@ -4,6 +4,20 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from metro_data import load_station_data, load_connection_data, load_passenger_data
 from route_finder import find_route, get_all_stations
+from anomaly_detection import StationAnomalyDetector
+from query_engine import (
+    create_connection,
+    data_version,
+    export_parquet,
+    get_table_schemas,
+    normalize_query,
+    read_station_hourly,
+    refresh_tables,
+    run_query,
+    DEFAULT_ROW_LIMIT,
+    MAX_ROW_LIMIT,
+    EXAMPLE_QUERIES
+)
 from visualization import (
     plot_monthly_passengers,
     plot_yearly_passengers,
@@ -20,6 +34,48 @@ st.set_page_config(
     layout="wide"
 )
 
+def show_chart(chart):
+    """
+    Display a chart returned by the visualization module
+    """
+    # Vega-Lite specs are dicts, anything else is a matplotlib figure
+    if isinstance(chart, dict):
+        st.vega_lite_chart(chart, use_container_width=True)
+    else:
+        st.pyplot(chart)
+        plt.close(chart)
+
+@st.cache_resource
+def get_query_connection():
+    """
+    Shared DuckDB connection for the Ad-hoc Query page
+    """
+    return create_connection()
+
+@st.cache_data(max_entries=100, show_spinner=False)
+def cached_query(sql, limit, version):
+    """
+    Run an ad-hoc query, caching results by query text, row limit and data version
+    """
+    refresh_tables()
+    return run_query(get_query_connection(), sql, limit)
+
+@st.cache_resource
+def get_anomaly_detector():
+    """
+    Shared anomaly detector that keeps its running statistics across reruns
+    """
+    return StationAnomalyDetector(load_station_data()['Station_ID'].tolist())
+
+def get_station_alerts():
+    """
+    Feed new rows of the hourly station feed to the detector and get recent alerts
+    """
+    detector = get_anomaly_detector()
+    export_parquet('station_hourly')
+    detector.process(read_station_hourly(get_query_connection(), detector.resume_from()))
+    return detector.recent_alerts()
+
 # Title
 st.title("Bengaluru Metro Analysis Dashboard")
 st.markdown("""
@@ -39,7 +95,7 @@ except Exception as e:
 
 # Sidebar navigation
 st.sidebar.title("Navigation")
-page = st.sidebar.radio("Select a page:", ["Route Finder", "Passenger Analysis", "Station Statistics"])
+page = st.sidebar.radio("Select a page:", ["Route Finder", "Passenger Analysis", "Station Statistics", "Ad-hoc Query"])
 
 if page == "Route Finder":
     st.header("Metro Route Finder")
@@ -104,7 +160,7 @@ elif page == "Passenger Analysis":
         
         # Plot
         fig = plot_monthly_passengers(year_data, selected_year)
-        st.pyplot(fig)
+        show_chart(fig)
         
        
         
@@ -112,7 +168,7 @@ elif page == "Passenger Analysis":
         st.subheader("Yearly Passenger Data")
         
         fig = plot_yearly_passengers(passenger_df)
-        st.pyplot(fig)
+        show_chart(fig)
         
         # Statistics
         st.subheader("Yearly Statistics")
@@ -126,7 +182,7 @@ elif page == "Passenger Analysis":
         st.subheader("Passenger Growth Analysis")
         
         fig = plot_passenger_growth(passenger_df)
-        st.pyplot(fig)
+        show_chart(fig)
         
         # Year-over-year growth statistics
         st.subheader("Year-over-Year Growth")
@@ -148,13 +204,55 @@ elif page == "Station Statistics":
     # Peak hours analysis
     st.subheader("Peak Hours Analysis")
     fig_peak = plot_peak_hours(selected_station, selected_year)
-    st.pyplot(fig_peak)
+    show_chart(fig_peak)
     
     # Station traffic comparison
     st.subheader("Station Traffic Comparison")
     top_n = st.slider("Select number of stations to compare:", 5, 20, 10)
     fig_traffic = plot_station_traffic(passenger_df, stations_df, selected_year, top_n)
-    st.pyplot(fig_traffic)
+    show_chart(fig_traffic)
+    
+    # Ridership alerts from the hourly station feed
+    st.subheader("Ridership Alerts")
+    alerts = get_station_alerts()
+    station_id = stations_df.loc[stations_df['Station_Name'] == selected_station, 'Station_ID'].iloc[0]
+    station_alerts = alerts[alerts['Station_ID'] == station_id]
+    
+    if station_alerts.empty:
+        st.success(f"No abnormal surges or drops detected at {selected_station}.")
+    else:
+        st.warning(f"{len(station_alerts)} abnormal hours detected at {selected_station}.")
+        st.dataframe(station_alerts.drop(columns='Station_ID').sort_values('Timestamp', ascending=False), hide_index=True)
+    
+    st.caption(f"{len(alerts)} alerts across {alerts['Station_ID'].nunique()} stations in the recent hourly feed.")
+
+elif page == "Ad-hoc Query":
+    st.header("Ad-hoc Ridership Query")
+    st.markdown("Run read-only SQL against the `passengers`, `stations`, `connections` and `station_hourly` tables.")
+    
+    con = get_query_connection()
+    
+    # Table schemas
+    with st.expander("Available tables"):
+        for table, schema in get_table_schemas(con).items():
+            st.markdown(f"**{table}**")
+            st.dataframe(schema, hide_index=True)
+    
+    example = st.selectbox("Start from an example:", list(EXAMPLE_QUERIES))
+    sql = st.text_area("SQL query:", EXAMPLE_QUERIES[example], height=160)
+    limit = st.number_input("Maximum rows to return:", 1, MAX_ROW_LIMIT, DEFAULT_ROW_LIMIT)
+    
+    if st.button("Run Query"):
+        try:
+            result, truncated = cached_query(normalize_query(sql), int(limit), data_version())
+        except Exception as e:
+            st.error(f"Query failed: {e}")
+        else:
+            if truncated:
+                st.warning(f"Showing the first {int(limit):,} rows. Add filters or aggregates to narrow the result.")
+            else:
+                st.info(f"{len(result):,} rows returned")
+            st.dataframe(result)
 
 # Footer
 st.sidebar.markdown("---")
\ No newline at end of file
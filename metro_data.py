@@ -191,3 +191,64 @@ def load_passenger_data():
         os.makedirs('data', exist_ok=True)
         df.to_csv(file_path, index=False)
         return df
+
+def load_station_hourly_data(weeks=8):
+    """
+    Load hourly passenger counts per station from CSV.
+    `weeks` only sets the length of the sample data generated when the CSV
+    does not exist yet; an existing CSV is returned as is.
+    """
+    file_path = os.path.join('data', 'station_hourly_data.csv')
+    
+    try:
+        df = pd.read_csv(file_path, parse_dates=['Timestamp'])
+        return df
+    except FileNotFoundError:
+        # If file not found, create sample data from the latest month of passenger data
+        import numpy as np
+        
+        stations_df = load_station_data()
+        passenger_df = load_passenger_data()
+        
+        latest = passenger_df.sort_values(['Year', 'Month']).iloc[-1]
+        end = pd.Timestamp(year=int(latest['Year']), month=int(latest['Month']), day=1) + pd.offsets.MonthEnd(0)
+        timestamps = pd.date_range(end=end + pd.Timedelta(hours=23), periods=weeks * 7 * 24, freq='h')
+        
+        # Average daily riders per station, with busier central stations
+        station_ids = stations_df['Station_ID'].to_numpy()
+        n_stations = len(station_ids)
+        station_weights = np.where(station_ids <= 12, 1.6, np.where(station_ids <= 36, 1.0, 0.7))
+        station_weights = station_weights / station_weights.sum()
+        daily_riders = latest['Passengers'] / 30 * station_weights
+        
+        # Share of daily riders by hour of day; the metro runs from 5 AM to 11 PM
+        hourly_profile = np.zeros(24)
+        hourly_profile[5:24] = [
+            500, 1200, 2500, 3500, 3000,
+            2000, 1500, 1200, 1500, 1800,
+            2000, 2500, 3500, 4000, 3500,
+            2500, 1500, 800, 300
+        ]
+        hourly_profile = hourly_profile / hourly_profile.sum()
+        
+        hours = timestamps.hour.to_numpy()
+        weekend_factor = np.where(timestamps.dayofweek.to_numpy() >= 5, 0.7, 1.0)
+        expected = np.outer(hourly_profile[hours] * weekend_factor, daily_riders)
+        counts = np.random.poisson(expected * np.random.uniform(0.9, 1.1, size=expected.shape))
+        
+        # Add a few surges (events) and drops (disruptions) in the last two weeks
+        recent = np.where((timestamps >= end - pd.Timedelta(days=14)) & (hours >= 7) & (hours <= 20))[0]
+        for _ in range(10):
+            t = np.random.choice(recent)
+            s = np.random.randint(n_stations)
+            factor = np.random.choice([2.5, 0.2])
+            counts[t:t + 3, s] = (counts[t:t + 3, s] * factor).astype(int)
+        
+        df = pd.DataFrame({
+            'Timestamp': np.repeat(timestamps, n_stations),
+            'Station_ID': np.tile(station_ids, len(timestamps)),
+            'Passengers': counts.ravel()
+        })
+        os.makedirs('data', exist_ok=True)
+        df.to_csv(file_path, index=False)
+        return df
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import duckdb
+from metro_data import load_station_data, load_connection_data, load_passenger_data, load_station_hourly_data
+
+# Columnar copies of the metro tables live next to the CSV files
+PARQUET_DIR = os.path.join('data', 'parquet')
+
+# Table name -> (source CSV, loader that creates it if missing)
+TABLES = {
+    'passengers': (os.path.join('data', 'passenger_data.csv'), load_passenger_data),
+    'stations': (os.path.join('data', 'bengaluru_metro_stations.csv'), load_station_data),
+    'connections': (os.path.join('data', 'bengaluru_metro_connections.csv'), load_connection_data),
+    'station_hourly': (os.path.join('data', 'station_hourly_data.csv'), load_station_hourly_data),
+}
+
+DEFAULT_ROW_LIMIT = 1000
+MAX_ROW_LIMIT = 10000
+
+EXAMPLE_QUERIES = {
+    'Monthly average by year': (
+        "SELECT Year, AVG(Passengers) AS avg_monthly, SUM(Passengers) AS total\n"
+        "FROM passengers\n"
+        "GROUP BY Year\n"
+        "ORDER BY Year"
+    ),
+    'Purple Line share by month': (
+        "SELECT Year, Month,\n"
+        "       ROUND(100.0 * Purple_Line_Passengers / Passengers, 2) AS purple_share\n"
+        "FROM passengers\n"
+        "WHERE Year >= 2022\n"
+        "ORDER BY Year, Month"
+    ),
+    'Track length by line': (
+        "SELECT Line, COUNT(*) AS segments, ROUND(SUM(Distance_KM), 2) AS total_km\n"
+        "FROM connections\n"
+        "GROUP BY Line\n"
+        "ORDER BY total_km DESC"
+    ),
+    'Busiest stations by hour of day': (
+        "SELECT s.Station_Name, HOUR(h.Timestamp) AS hour, AVG(h.Passengers) AS avg_passengers\n"
+        "FROM station_hourly h\n"
+        "JOIN stations s USING (Station_ID)\n"
+        "GROUP BY ALL\n"
+        "ORDER BY avg_passengers DESC"
+    ),
+}
+
+def data_version():
+    """
+    Get the modification times of the source CSVs, used to key cached results
+    """
+    return tuple(
+        os.path.getmtime(csv_path) if os.path.exists(csv_path) else 0
+        for csv_path, _ in TABLES.values()
+    )
+
+def export_parquet(table):
+    """
+    Write a metro table to Parquet, refreshing it when the CSV is newer
+    """
+    csv_path, loader = TABLES[table]
+    parquet_path = os.path.abspath(os.path.join(PARQUET_DIR, f'{table}.parquet'))
+
+    if os.path.exists(parquet_path) and os.path.exists(csv_path):
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+            return parquet_path
+
+    # The pandas loader is only needed to generate sample data; an existing
+    # CSV is streamed into Parquet by DuckDB without loading it into memory
+    if not os.path.exists(csv_path):
+        loader()
+    os.makedirs(PARQUET_DIR, exist_ok=True)
+
+    # Write to a uniquely named temporary file and swap it in, so running
+    # queries and concurrent refreshes never see a partially written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(parquet_path), suffix='.parquet')
+    os.close(fd)
+    con = duckdb.connect()
+    try:
+        con.execute(f"COPY (SELECT * FROM read_csv('{os.path.abspath(csv_path)}')) TO '{tmp_path}' (FORMAT PARQUET)")
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    finally:
+        con.close()
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+def refresh_tables():
+    """
+    Re-export any table whose CSV changed since its Parquet file was written
+    """
+    for table in TABLES:
+        export_parquet(table)
+
+def create_connection():
+    """
+    Create an in-process DuckDB connection with a view over each metro table
+    """
+    con = duckdb.connect()
+
+    # Views read the Parquet files directly so filters, projections and
+    # aggregates are pushed down to the column scan
+    for table in TABLES:
+        parquet_path = export_parquet(table)
+        con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{parquet_path}')")
+
+    # Ad-hoc queries may only read the exported tables: no other files, no
+    # network access and no extension loading, and the settings can't be undone
+    allowed_dir = os.path.abspath(PARQUET_DIR) + os.sep
+    con.execute(f"SET allowed_directories = ['{allowed_dir}']")
+    con.execute("SET enable_external_access = false")
+    con.execute("SET autoinstall_known_extensions = false")
+    con.execute("SET autoload_known_extensions = false")
+    con.execute("SET lock_configuration = true")
+
+    return con
+
+def get_table_schemas(con):
+    """
+    Get the column names and types of each registered table
+    """
+    schemas = {}
+    for table in TABLES:
+        schemas[table] = con.cursor().execute(f"DESCRIBE {table}").df()[['column_name', 'column_type']]
+    return schemas
+
+def read_station_hourly(con, since=None):
+    """
+    Read hourly station counts after a timestamp, or all of them when since is None
+    """
+    # The filter is pushed down to the Parquet scan, so only new row groups are read
+    cursor = con.cursor()
+    try:
+        if since is None:
+            return cursor.execute("SELECT * FROM station_hourly").df()
+        return cursor.execute("SELECT * FROM station_hourly WHERE Timestamp > ?", [since]).df()
+    finally:
+        cursor.close()
+
+def normalize_query(sql):
+    """
+    Strip whitespace and trailing semicolons from a query
+    """
+    return sql.strip().rstrip(';').strip()
+
+def run_query(con, sql, limit=DEFAULT_ROW_LIMIT):
+    """
+    Run a read-only query and return (result dataframe, truncated flag)
+    """
+    sql = normalize_query(sql)
+
+    if not sql:
+        raise ValueError("Query is empty.")
+
+    limit = max(1, min(int(limit), MAX_ROW_LIMIT))
+
+    cursor = con.cursor()
+    try:
+        # Parse rather than pattern-match, so comments, VALUES and FROM-first
+        # queries are accepted; the locked connection keeps queries read-only
+        statements = cursor.extract_statements(sql)
+        if len(statements) != 1:
+            raise ValueError("Only a single statement can be run at a time.")
+        if statements[0].type != duckdb.StatementType.SELECT:
+            raise ValueError("Only SELECT queries are allowed.")
+
+        # Apply the limit through the relation API instead of wrapping the
+        # query text, and fetch one extra row to tell whether the result was
+        # cut off
+        df = cursor.sql(statements[0].query).limit(limit + 1).df()
+    finally:
+        cursor.close()
+
+    truncated = len(df) > limit
+    return df.head(limit), truncated
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from anomaly_detection import StationAnomalyDetector, detect_anomalies, HOURS_PER_WEEK
+
+N_STATIONS = 50
+WEEKS = 8
+
+
+def make_feed(seed, surges=()):
+    """
+    Poisson hourly counts for every station with a daily ridership profile,
+    plus (hour index, station index) surges at 2.5x the usual count
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range('2023-11-06', periods=WEEKS * HOURS_PER_WEEK, freq='h')
+    profile = np.where((timestamps.hour >= 5), 20 + 180 * np.sin(np.pi * timestamps.hour / 24) ** 2, 0)
+    station_scale = rng.uniform(0.3, 1.5, N_STATIONS)
+    counts = rng.poisson(np.outer(profile, station_scale))
+
+    for t, s in surges:
+        counts[t, s] = int(counts[t, s] * 2.5)
+
+    return pd.DataFrame({
+        'Timestamp': np.repeat(timestamps, N_STATIONS),
+        'Station_ID': np.tile(np.arange(1, N_STATIONS + 1), len(timestamps)),
+        'Passengers': counts.ravel()
+    })
+
+
+def test_clean_feed_has_low_false_positive_rate():
+    scored = N_STATIONS * HOURS_PER_WEEK * (WEEKS - 6)
+    for seed in range(5):
+        alerts = detect_anomalies(make_feed(seed), list(range(1, N_STATIONS + 1)))
+        assert len(alerts) / scored < 1e-3
+
+
+def test_injected_surges_are_caught():
+    rng = np.random.default_rng(42)
+    # Busy daytime hours in the last week, after the warm-up period
+    last_week = (WEEKS - 1) * HOURS_PER_WEEK
+    hours = [last_week + day * 24 + hour for day in range(7) for hour in range(9, 18)]
+    surges = list(zip(rng.choice(hours, 20, replace=False), rng.choice(N_STATIONS, 20)))
+
+    feed = make_feed(0, surges)
+    alerts = detect_anomalies(feed, list(range(1, N_STATIONS + 1)))
+
+    timestamps = feed['Timestamp'].unique()
+    expected = {(pd.Timestamp(timestamps[t]), int(s) + 1) for t, s in surges}
+    caught = set(zip(alerts['Timestamp'], alerts['Station_ID'])) & expected
+    assert len(caught) >= 0.9 * len(expected)
+    assert (alerts['Type'] == 'Surge').all()
+
+
+def test_process_only_feeds_new_rows():
+    feed = make_feed(1, [((WEEKS - 1) * HOURS_PER_WEEK + 12, 3)])
+    station_ids = list(range(1, N_STATIONS + 1))
+    split = feed['Timestamp'].iloc[len(feed) // 2]
+
+    detector = StationAnomalyDetector(station_ids)
+    detector.process(feed[feed['Timestamp'] <= split])
+    count_before = detector.count.sum()
+
+    # Re-sending already processed rows must not update the statistics twice
+    detector.process(feed)
+    assert detector.count.sum() == count_before + (feed['Timestamp'] > split).sum()
+    assert detector.last_timestamp == feed['Timestamp'].max()
+
+    full = detect_anomalies(feed, station_ids)
+    pd.testing.assert_frame_equal(detector.recent_alerts(), full)
+
+
+def test_unknown_stations_are_ignored():
+    feed = make_feed(2)
+    unknown = feed.head(3).assign(Station_ID=999)
+
+    detector = StationAnomalyDetector(list(range(1, N_STATIONS + 1)))
+    detector.process(pd.concat([unknown, feed]))
+    assert detector.count.sum() == len(feed)
+
+
+def test_late_station_counts_are_still_scored():
+    feed = make_feed(3, [((WEEKS - 1) * HOURS_PER_WEEK + 12, 3)])
+    station_ids = list(range(1, N_STATIONS + 1))
+    surge_time = feed['Timestamp'].unique()[(WEEKS - 1) * HOURS_PER_WEEK + 12]
+    feed = feed[feed['Timestamp'] <= surge_time + pd.Timedelta(hours=1)]
+    late = (feed['Timestamp'] >= surge_time) & (feed['Station_ID'] == 4)
+
+    # The surging station's counts arrive after the other stations' next hour
+    detector = StationAnomalyDetector(station_ids)
+    detector.process(feed[~late])
+    detector.process(feed)
+
+    alerts = detector.recent_alerts()
+    assert ((alerts['Timestamp'] == surge_time) & (alerts['Station_ID'] == 4)).any()
+    assert detector.resume_from() == surge_time + pd.Timedelta(hours=1) - detector.max_lateness
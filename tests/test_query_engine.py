@@ -0,0 +1,122 @@
+import os
+import threading
+import duckdb
+import pandas as pd
+import pytest
+from query_engine import create_connection, export_parquet, read_station_hourly, run_query, PARQUET_DIR, TABLES
+
+
+@pytest.fixture
+def con(tmp_path, monkeypatch):
+    # Loaders generate sample CSVs under ./data, so keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    connection = create_connection()
+    yield connection
+    connection.close()
+
+
+def test_queries_registered_tables(con):
+    df, truncated = run_query(con, "SELECT Year, SUM(Passengers) AS total FROM passengers GROUP BY Year")
+    assert len(df) == 5
+    assert not truncated
+
+
+def test_result_is_truncated_at_limit(con):
+    df, truncated = run_query(con, "SELECT * FROM stations", limit=10)
+    assert len(df) == 10
+    assert truncated
+
+
+@pytest.mark.parametrize('sql', [
+    "SELECT * FROM read_text('/etc/passwd')",
+    "SELECT * FROM read_csv('/etc/passwd')",
+    "SELECT * FROM read_csv('data/passenger_data.csv')",
+    "SELECT * FROM glob('/root/*')",
+])
+def test_outside_files_are_rejected(con, sql):
+    with pytest.raises(duckdb.PermissionException):
+        run_query(con, sql)
+
+
+def test_configuration_is_locked(con):
+    with pytest.raises(duckdb.Error):
+        con.execute("SET enable_external_access = true")
+
+
+@pytest.mark.parametrize('sql', [
+    "SELECT 1\n-- note",
+    "SELECT 1; -- note",
+    "/* note */ SELECT 1",
+    "(SELECT 1)",
+    "VALUES (1)",
+    "FROM passengers LIMIT 1",
+    "SELECT ';' AS a",
+])
+def test_read_only_query_forms_are_accepted(con, sql):
+    df, _ = run_query(con, sql)
+    assert len(df) == 1
+
+
+@pytest.mark.parametrize('sql', [
+    "DROP VIEW passengers",
+    "SELECT 1; SELECT 2",
+    "COPY passengers TO 'out.csv'",
+    "/* note */ DROP VIEW passengers",
+])
+def test_non_select_statements_are_rejected(con, sql):
+    with pytest.raises(ValueError):
+        run_query(con, sql)
+
+
+def test_changed_csv_is_re_exported(con):
+    csv_path, _ = TABLES['stations']
+    df = pd.read_csv(csv_path).head(3)
+    df.to_csv(csv_path, index=False)
+
+    # Make sure the CSV is newer than the existing Parquet file
+    parquet_mtime = os.path.getmtime(os.path.join('data', 'parquet', 'stations.parquet'))
+    os.utime(csv_path, (parquet_mtime + 10, parquet_mtime + 10))
+
+    export_parquet('stations')
+    result, _ = run_query(con, "SELECT COUNT(*) AS n FROM stations")
+    assert result['n'].iloc[0] == 3
+
+
+def test_existing_csv_is_exported_without_the_loader(con, monkeypatch):
+    csv_path, _ = TABLES['station_hourly']
+    os.utime(csv_path)
+    os.remove(os.path.join(PARQUET_DIR, 'station_hourly.parquet'))
+
+    def fail():
+        raise AssertionError("loader should not run when the CSV exists")
+
+    monkeypatch.setitem(TABLES, 'station_hourly', (csv_path, fail))
+    export_parquet('station_hourly')
+
+    schema = con.execute("DESCRIBE station_hourly").df().set_index('column_name')['column_type']
+    assert schema['Timestamp'] == 'TIMESTAMP'
+
+
+def test_concurrent_exports_do_not_share_temporary_files(con):
+    csv_path, _ = TABLES['passengers']
+    parquet_mtime = os.path.getmtime(os.path.join(PARQUET_DIR, 'passengers.parquet'))
+    os.utime(csv_path, (parquet_mtime + 10, parquet_mtime + 10))
+
+    threads = [threading.Thread(target=export_parquet, args=('passengers',)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(os.listdir(PARQUET_DIR)) == sorted(f'{table}.parquet' for table in TABLES)
+    result, _ = run_query(con, "SELECT COUNT(*) AS n FROM passengers")
+    assert result['n'].iloc[0] == 60
+
+
+def test_station_hourly_reads_only_new_rows(con):
+    full = read_station_hourly(con)
+    since = full['Timestamp'].max() - pd.Timedelta(hours=2)
+
+    new_rows = read_station_hourly(con, since)
+    assert (new_rows['Timestamp'] > since).all()
+    assert len(new_rows) == (full['Timestamp'] > since).sum()
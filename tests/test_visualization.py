@@ -0,0 +1,58 @@
+import json
+import pytest
+from metro_data import load_station_data, load_passenger_data
+from visualization import (
+    plot_monthly_passengers,
+    plot_yearly_passengers,
+    plot_line_utilization,
+    plot_peak_hours,
+    plot_passenger_growth,
+    plot_station_traffic
+)
+
+
+@pytest.fixture
+def data(tmp_path, monkeypatch):
+    # Loaders generate sample CSVs under ./data, so keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    return load_passenger_data(), load_station_data()
+
+
+def vega_charts(passenger_df, stations_df):
+    year_data = passenger_df[passenger_df['Year'] == 2023]
+    return {
+        # Expected number of aggregated rows in each spec
+        'monthly': (plot_monthly_passengers(year_data, 2023, mode='vega'), 12 * 3),
+        'yearly': (plot_yearly_passengers(passenger_df, mode='vega'), 5 * 2),
+        'utilization': (plot_line_utilization(passenger_df, 2023, mode='vega'), 12 * 2),
+        'growth': (plot_passenger_growth(passenger_df, mode='vega'), 5),
+        'peak_hours': (plot_peak_hours('Majestic', 2023, mode='vega'), 19),
+        'station_traffic': (plot_station_traffic(passenger_df, stations_df, 2023, 10, mode='vega'), 10),
+    }
+
+
+def test_vega_specs_carry_only_aggregates(data):
+    for name, (spec, expected_rows) in vega_charts(*data).items():
+        assert isinstance(spec, dict), name
+        assert spec['$schema'].startswith('https://vega.github.io/schema/vega-lite/')
+        assert len(spec['data']['values']) == expected_rows, name
+
+        # Specs are sent to the browser as JSON
+        json.dumps(spec)
+
+
+def test_invalid_mode_is_rejected(data):
+    passenger_df, _ = data
+    with pytest.raises(ValueError):
+        plot_passenger_growth(passenger_df, mode='svg')
+
+
+def test_vega_specs_match_vega_lite_schema(data):
+    # altair ships with streamlit and bundles the Vega-Lite JSON schema
+    pytest.importorskip('altair')
+    import jsonschema
+    from altair.vegalite.v5.schema import load_schema
+
+    schema = load_schema()
+    for name, (spec, _) in vega_charts(*data).items():
+        jsonschema.validate(spec, schema)
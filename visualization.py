@@ -2,24 +2,96 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import os
 from calendar import month_name
 
 # Set Seaborn style for plots
 sns.set_style("whitegrid")
 plt.rcParams.update({'font.size': 12})
 
-def plot_monthly_passengers(data, year):
+# Chart rendering mode for the deployment: 'matplotlib' renders a figure on the
+# server, 'vega' returns a Vega-Lite spec carrying only the aggregated data so
+# the chart is drawn in the browser
+CHART_MODES = ('matplotlib', 'vega')
+CHART_MODE = os.environ.get('METRO_CHART_MODE', 'matplotlib').lower()
+
+if CHART_MODE not in CHART_MODES:
+    raise ValueError(f"METRO_CHART_MODE must be one of {CHART_MODES}, got {CHART_MODE!r}")
+
+LINE_COLORS = {'Purple Line': 'purple', 'Green Line': 'green'}
+
+def use_vega(mode=None):
+    """
+    Check whether charts should be returned as Vega-Lite specs
+    """
+    mode = mode or CHART_MODE
+    if mode not in CHART_MODES:
+        raise ValueError(f"Chart mode must be one of {CHART_MODES}, got {mode!r}")
+    return mode == 'vega'
+
+def _vega_spec(title, values, width=700, height=350, **spec):
+    """
+    Build a Vega-Lite spec with the aggregated data inlined
+    """
+    return {
+        '$schema': 'https://vega.github.io/schema/vega-lite/v5.json',
+        'title': title,
+        'width': width,
+        'height': height,
+        'data': {'values': values},
+        **spec
+    }
+
+def _line_color_scale():
+    return {'domain': list(LINE_COLORS), 'range': list(LINE_COLORS.values())}
+
+def plot_monthly_passengers(data, year, mode=None):
     """
     Plot monthly passenger data for a specific year
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
     # Month names for the x-axis
     months = [month_name[i] for i in range(1, 13)]
     
     # Prepare data
     monthly_data = data.sort_values('Month')
     
+    if use_vega(mode):
+        values = []
+        for _, row in monthly_data.iterrows():
+            month = month_name[int(row['Month'])]
+            values.append({'Month': month, 'Line': 'Purple Line', 'Passengers': int(row['Purple_Line_Passengers'])})
+            values.append({'Month': month, 'Line': 'Green Line', 'Passengers': int(row['Green_Line_Passengers'])})
+            values.append({'Month': month, 'Line': 'Total', 'Passengers': int(row['Passengers'])})
+        month_axis = {'field': 'Month', 'type': 'ordinal', 'sort': months, 'axis': {'labelAngle': -45}}
+        return _vega_spec(
+            f'Monthly Passenger Data for {year}', values,
+            layer=[
+                {
+                    'transform': [{'filter': "datum.Line != 'Total'"}],
+                    'mark': {'type': 'bar', 'opacity': 0.7},
+                    'encoding': {
+                        'x': month_axis,
+                        'xOffset': {'field': 'Line', 'sort': list(LINE_COLORS)},
+                        'y': {'field': 'Passengers', 'type': 'quantitative', 'title': 'Passengers by Line'},
+                        'color': {'field': 'Line', 'type': 'nominal', 'scale': _line_color_scale()},
+                        'tooltip': [{'field': 'Month'}, {'field': 'Line'}, {'field': 'Passengers', 'format': ','}]
+                    }
+                },
+                {
+                    'transform': [{'filter': "datum.Line == 'Total'"}],
+                    'mark': {'type': 'line', 'color': 'red', 'point': True, 'strokeWidth': 2},
+                    'encoding': {
+                        'x': month_axis,
+                        'y': {'field': 'Passengers', 'type': 'quantitative', 'title': 'Total Passengers'},
+                        'tooltip': [{'field': 'Month'}, {'field': 'Passengers', 'format': ',', 'title': 'Total'}]
+                    }
+                }
+            ],
+            resolve={'scale': {'y': 'independent'}}
+        )
+    
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
     # Plot bars for Purple and Green lines
     x = np.arange(len(months))
     width = 0.35
@@ -49,12 +121,10 @@ def plot_monthly_passengers(data, year):
     plt.tight_layout()
     return fig
 
-def plot_yearly_passengers(data):
+def plot_yearly_passengers(data, mode=None):
     """
     Plot yearly passenger data
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
     # Aggregate data by year
     yearly_data = data.groupby('Year').agg({
         'Passengers': 'sum',
@@ -62,6 +132,39 @@ def plot_yearly_passengers(data):
         'Green_Line_Passengers': 'sum'
     }).reset_index()
     
+    if use_vega(mode):
+        values = []
+        for _, row in yearly_data.iterrows():
+            year = str(int(row['Year']))
+            values.append({'Year': year, 'Line': 'Purple Line', 'Passengers': int(row['Purple_Line_Passengers']), 'Total': int(row['Passengers'])})
+            values.append({'Year': year, 'Line': 'Green Line', 'Passengers': int(row['Green_Line_Passengers']), 'Total': int(row['Passengers'])})
+        return _vega_spec(
+            'Yearly Passenger Data', values,
+            layer=[
+                {
+                    'mark': {'type': 'bar', 'opacity': 0.7},
+                    'encoding': {
+                        'x': {'field': 'Year', 'type': 'ordinal'},
+                        'y': {'field': 'Passengers', 'type': 'quantitative', 'aggregate': 'sum', 'title': 'Total Passengers'},
+                        'color': {'field': 'Line', 'type': 'nominal', 'scale': _line_color_scale()},
+                        'order': {'field': 'Line', 'sort': 'descending'},
+                        'tooltip': [{'field': 'Year'}, {'field': 'Line'}, {'field': 'Passengers', 'format': ','}]
+                    }
+                },
+                {
+                    'transform': [{'filter': "datum.Line == 'Purple Line'"}],
+                    'mark': {'type': 'text', 'dy': -8, 'fontWeight': 'bold'},
+                    'encoding': {
+                        'x': {'field': 'Year', 'type': 'ordinal'},
+                        'y': {'field': 'Total', 'type': 'quantitative'},
+                        'text': {'field': 'Total', 'format': ','}
+                    }
+                }
+            ]
+        )
+    
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
     # Plot stacked bars
     ax.bar(yearly_data['Year'], yearly_data['Purple_Line_Passengers'], color='purple', alpha=0.7, label='Purple Line')
     ax.bar(yearly_data['Year'], yearly_data['Green_Line_Passengers'], bottom=yearly_data['Purple_Line_Passengers'], 
@@ -81,12 +184,10 @@ def plot_yearly_passengers(data):
     plt.tight_layout()
     return fig
 
-def plot_line_utilization(data, year):
+def plot_line_utilization(data, year, mode=None):
     """
     Plot metro line utilization for a specific year
     """
-    fig, ax = plt.subplots(figsize=(14, 7))
-    
     # Filter data for the selected year
     year_data = data[data['Year'] == year].copy()
     year_data['Purple_Line_Percentage'] = year_data['Purple_Line_Passengers'] / year_data['Passengers'] * 100
@@ -95,6 +196,35 @@ def plot_line_utilization(data, year):
     # Month names for the x-axis
     months = [month_name[i] for i in range(1, 13)]
     
+    if use_vega(mode):
+        values = []
+        for _, row in year_data.iterrows():
+            month = month_name[int(row['Month'])]
+            values.append({'Month': month, 'Line': 'Purple Line', 'Percentage': round(float(row['Purple_Line_Percentage']), 2)})
+            values.append({'Month': month, 'Line': 'Green Line', 'Percentage': round(float(row['Green_Line_Percentage']), 2)})
+        return _vega_spec(
+            f'Line Utilization Percentage in {year}', values,
+            layer=[
+                {
+                    'mark': {'type': 'line', 'point': True, 'strokeWidth': 2},
+                    'encoding': {
+                        'x': {'field': 'Month', 'type': 'ordinal', 'sort': months, 'axis': {'labelAngle': -45}},
+                        'y': {'field': 'Percentage', 'type': 'quantitative', 'scale': {'domain': [0, 100]},
+                              'title': 'Percentage of Total Passengers'},
+                        'color': {'field': 'Line', 'type': 'nominal', 'scale': _line_color_scale()},
+                        'tooltip': [{'field': 'Month'}, {'field': 'Line'}, {'field': 'Percentage'}]
+                    }
+                },
+                {
+                    'data': {'values': [{'y': 50}]},
+                    'mark': {'type': 'rule', 'color': 'gray', 'strokeDash': [4, 4]},
+                    'encoding': {'y': {'field': 'y', 'type': 'quantitative'}}
+                }
+            ]
+        )
+    
+    fig, ax = plt.subplots(figsize=(14, 7))
+    
     # Create line plot
     x = np.arange(len(months))
     
@@ -120,16 +250,62 @@ def plot_line_utilization(data, year):
     plt.tight_layout()
     return fig
 
-def plot_passenger_growth(data):
+def plot_passenger_growth(data, mode=None):
     """
     Plot passenger growth rate year over year
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
     # Calculate year over year growth
     yearly_total = data.groupby('Year')['Passengers'].sum().reset_index()
     yearly_total['Growth'] = yearly_total['Passengers'].pct_change() * 100
     
+    if use_vega(mode):
+        values = [
+            {
+                'Year': str(int(row['Year'])),
+                'Passengers': int(row['Passengers']),
+                'Growth': None if pd.isna(row['Growth']) else round(float(row['Growth']), 2)
+            }
+            for _, row in yearly_total.iterrows()
+        ]
+        year_axis = {'field': 'Year', 'type': 'ordinal'}
+        return _vega_spec(
+            'Annual Passenger Growth', values,
+            layer=[
+                {
+                    'layer': [
+                        {
+                            'mark': {'type': 'bar', 'color': 'royalblue', 'opacity': 0.7},
+                            'encoding': {
+                                'x': year_axis,
+                                'y': {'field': 'Passengers', 'type': 'quantitative', 'title': 'Total Passengers'},
+                                'tooltip': [{'field': 'Year'}, {'field': 'Passengers', 'format': ','}]
+                            }
+                        },
+                        {
+                            'mark': {'type': 'text', 'dy': -8},
+                            'encoding': {
+                                'x': year_axis,
+                                'y': {'field': 'Passengers', 'type': 'quantitative'},
+                                'text': {'field': 'Passengers', 'format': ','}
+                            }
+                        }
+                    ]
+                },
+                {
+                    'transform': [{'filter': 'datum.Growth != null'}],
+                    'mark': {'type': 'line', 'color': 'red', 'point': {'color': 'red'}, 'strokeWidth': 2},
+                    'encoding': {
+                        'x': year_axis,
+                        'y': {'field': 'Growth', 'type': 'quantitative', 'title': 'Year-over-Year Growth (%)'},
+                        'tooltip': [{'field': 'Year'}, {'field': 'Growth', 'title': 'Growth (%)'}]
+                    }
+                }
+            ],
+            resolve={'scale': {'y': 'independent'}}
+        )
+    
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
     # Bar chart for total passengers
     bars = ax.bar(yearly_total['Year'], yearly_total['Passengers'], color='royalblue', alpha=0.7)
     
@@ -160,12 +336,10 @@ def plot_passenger_growth(data):
     plt.tight_layout()
     return fig
 
-def plot_peak_hours(station, year):
+def plot_peak_hours(station, year, mode=None):
     """
     Plot peak hours analysis for a station
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
     # Create sample hourly distribution data
     hours = list(range(5, 24))  # 5 AM to 11 PM
     
@@ -180,13 +354,35 @@ def plot_peak_hours(station, year):
     # Add some randomness
     hourly_distribution = [h * (1 + np.random.uniform(-0.1, 0.1)) for h in hourly_distribution]
     
-    # Plot bar chart
-    bars = ax.bar(hours, hourly_distribution, color='royalblue')
-    
     # Highlight peak hours
     peak_hours_morning = [8, 9]
     peak_hours_evening = [17, 18, 19]
     
+    if use_vega(mode):
+        peak_hours = peak_hours_morning + peak_hours_evening
+        values = [
+            {'Hour': f'{h}:00', 'Passengers': round(p), 'Peak': h in peak_hours}
+            for h, p in zip(hours, hourly_distribution)
+        ]
+        return _vega_spec(
+            f'Hourly Traffic at {station} Station ({year})', values,
+            mark='bar',
+            encoding={
+                'x': {'field': 'Hour', 'type': 'ordinal', 'sort': None, 'title': 'Hour of Day'},
+                'y': {'field': 'Passengers', 'type': 'quantitative', 'title': 'Average Number of Passengers'},
+                'color': {
+                    'field': 'Peak', 'type': 'nominal', 'legend': None,
+                    'scale': {'domain': [False, True], 'range': ['royalblue', 'red']}
+                },
+                'tooltip': [{'field': 'Hour'}, {'field': 'Passengers', 'format': ','}]
+            }
+        )
+    
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
+    # Plot bar chart
+    bars = ax.bar(hours, hourly_distribution, color='royalblue')
+    
     for hour in peak_hours_morning:
         idx = hours.index(hour)
         bars[idx].set_color('red')
@@ -214,12 +410,10 @@ def plot_peak_hours(station, year):
     plt.tight_layout()
     return fig
 
-def plot_station_traffic(passenger_data, station_data, year, top_n=10):
+def plot_station_traffic(passenger_data, station_data, year, top_n=10, mode=None):
     """
     Plot station traffic comparison
     """
-    fig, ax = plt.subplots(figsize=(14, 8))
-    
     # Create sample station traffic data
     stations = station_data['Station_Name'].tolist()[:top_n]
     
@@ -244,6 +438,36 @@ def plot_station_traffic(passenger_data, station_data, year, top_n=10):
     sorted_traffic = [traffic[i] for i in sorted_indices]
     sorted_colors = [colors[i] for i in sorted_indices]
     
+    if use_vega(mode):
+        values = [
+            {'Station': station, 'Line': line, 'Passengers': int(count)}
+            for station, line, count in zip(sorted_stations, [lines[i] for i in sorted_indices], sorted_traffic)
+        ]
+        return _vega_spec(
+            f'Station Traffic Comparison ({year})', values, height=max(250, 25 * len(values)),
+            layer=[
+                {
+                    'mark': {'type': 'bar', 'opacity': 0.7},
+                    'encoding': {
+                        'y': {'field': 'Station', 'type': 'nominal', 'sort': '-x'},
+                        'x': {'field': 'Passengers', 'type': 'quantitative', 'title': 'Annual Passenger Count'},
+                        'color': {'field': 'Line', 'type': 'nominal', 'scale': _line_color_scale()},
+                        'tooltip': [{'field': 'Station'}, {'field': 'Line'}, {'field': 'Passengers', 'format': ','}]
+                    }
+                },
+                {
+                    'mark': {'type': 'text', 'align': 'left', 'dx': 4},
+                    'encoding': {
+                        'y': {'field': 'Station', 'type': 'nominal', 'sort': '-x'},
+                        'x': {'field': 'Passengers', 'type': 'quantitative'},
+                        'text': {'field': 'Passengers', 'format': ','}
+                    }
+                }
+            ]
+        )
+    
+    fig, ax = plt.subplots(figsize=(14, 8))
+    
     # Plot horizontal bar chart
     bars = ax.barh(sorted_stations, sorted_traffic, color=sorted_colors, alpha=0.7)
     